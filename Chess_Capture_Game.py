@@ -1,20 +1,10 @@
-# Step 1: Define the chessboard and pieces
-def create_chessboard():
-    """
-    Creates an 8x8 chessboard with positions labeled from 'a1' to 'h8'.
-    
-    Returns:
-        dict: A dictionary representing the chessboard with all positions initialized to None.
-    """
-    rows = ['1', '2', '3', '4', '5', '6', '7', '8']
-    cols = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h']
-    board = {}
-    for col in cols:
-        for row in rows:
-            board[col + row] = None  # No piece at the start
-    return board
-
-# Define chess pieces and their movements
+from array import array
+
+from chess_common import (BK, KING_ATTACKS, PAWN_ATTACKS_WHITE, POS_TO_SQ, SQ_TO_POS,
+                          create_chessboard, get_piece_and_position, parse_position,
+                          piece_codes, piece_types, place_piece)
+
+# Step 1: Define chess pieces and their movements
 chess_pieces = {
     'king': 'King',      # King moves one square in any direction
     'queen': 'Queen',    # Queen moves diagonally, horizontally, or vertically
@@ -24,6 +14,10 @@ chess_pieces = {
     'pawn': 'Pawn'       # Pawn moves one square forward (with exceptions)
 }
 
+# Display strings for each piece, built once (e.g., 'pawn' -> 'Black Pawn')
+WHITE_STR = {piece: f'White {name}' for piece, name in chess_pieces.items()}
+BLACK_STR = {piece: f'Black {name}' for piece, name in chess_pieces.items()}
+
 # Step 2: Print game instructions for the user
 def print_instructions():
     """
@@ -55,58 +49,12 @@ Good luck!
 """
     print(instructions)
 
-# Helper function to check and convert position
-def parse_position(position):
-    """
-    Checks the position string and converts it to numerical coordinates.
-    
-    Returns:
-        tuple: (x, y) coordinates if valid, else (None, None).
-    """
-    if len(position) != 2:
-        return None, None
-    col, row = position[0], position[1]
-    if col not in 'abcdefgh' or row not in '12345678':
-        return None, None
-    x = ord(col) - ord('a')
-    y = int(row) - 1
-    return x, y
-
-# Helper function for user input
-def get_piece_and_position(prompt, allowed_pieces, board, existing_piece_counts=None, max_counts=None, total_pieces=None, max_total=16):
-    """
-    Asks the user to input a piece and its position, checking if the input is valid.
-    
-    Returns:
-        tuple: (piece, position) if valid, else ('done', 'done').
-    """
-    while True:
-        if total_pieces is not None and total_pieces >= max_total:
-            print(f"You have reached the maximum number of black pieces ({max_total}).")
-            return 'done', 'done'
-        
-        user_input = input(prompt).strip().lower()
-        if user_input == 'done':
-            return 'done', 'done'
-        parts = user_input.split()
-        if len(parts) != 2:
-            print("Please enter exactly two values: 'piece position' (e.g., 'queen h5').")
-            continue
-        piece, position = parts
-        if piece not in allowed_pieces:
-            print(f"Invalid piece. Allowed pieces: {', '.join(allowed_pieces)}.")
-            continue
-        if position not in board:
-            print("Invalid position. Please enter a position like 'e4'.")
-            continue
-        if board[position] is not None:
-            print("Position already taken. Choose a different position.")
-            continue
-        if existing_piece_counts and max_counts:
-            if existing_piece_counts.get(piece, 0) >= max_counts.get(piece, 1):
-                print(f"You cannot place more than {max_counts[piece]} {piece}(s).")
-                continue
-        return piece, position
+# Capture masks of the white pieces: the king takes on any adjacent square,
+# white pawns take diagonally forward (upwards)
+capture_tables = {
+    'king': KING_ATTACKS,
+    'pawn': PAWN_ATTACKS_WHITE
+}
 
 # Step 3: Get user input for white and black pieces
 def get_user_input(board):
@@ -140,8 +88,8 @@ def place_white_piece(board):
         if piece == 'done':
             print("You must place a white piece before proceeding.")
             continue
-        board[position] = f'White {chess_pieces[piece]}'
-        print(f"You placed a White {chess_pieces[piece]} at {position}.")
+        place_piece(board, 'White', piece, position)
+        print(f"You placed a {WHITE_STR[piece]} at {position}.")
         return piece, position
 
 def place_black_pieces(board):
@@ -149,9 +97,10 @@ def place_black_pieces(board):
     Asks the user to place black pieces on the board.
     
     Returns:
-        list: A list of tuples representing black pieces and their positions.
+        tuple: Parallel arrays (piece codes, squares) of the black pieces.
     """
-    black_pieces = []
+    black_codes = array('b')
+    black_squares = array('b')
     black_piece_counts = {
         'pawn': 0,
         'bishop': 0,
@@ -164,7 +113,7 @@ def place_black_pieces(board):
     max_total_pieces = 16  # Maximum number of black pieces allowed
     
     while True:
-        current_total = len(black_pieces)
+        current_total = len(black_codes)
         piece, position = get_piece_and_position(
             "Enter a black piece and its position (e.g., 'queen h5') or type 'done' to finish: ",
             allowed_pieces=allowed_pieces,
@@ -175,16 +124,17 @@ def place_black_pieces(board):
             max_total=max_total_pieces
         )
         if piece == 'done':
-            if black_pieces:
+            if black_codes:
                 break
             else:
                 print("You must add at least one black piece before typing 'done'.")
                 continue
-        board[position] = f'Black {chess_pieces[piece]}'
-        black_pieces.append((piece, position))
-        print(f"You placed a Black {chess_pieces[piece]} at {position}.")
+        place_piece(board, 'Black', piece, position)
+        black_codes.append(piece_codes[('Black', piece)])
+        black_squares.append(POS_TO_SQ[position])
+        print(f"You placed a {BLACK_STR[piece]} at {position}.")
     
-    return black_pieces
+    return black_codes, black_squares
 
 # Step 4: Determine which black pieces can be overtaken by the white piece
 def determine_overtakes(white_piece_type, white_piece_position, black_pieces):
@@ -195,26 +145,16 @@ def determine_overtakes(white_piece_type, white_piece_position, black_pieces):
         list: A list of black pieces that can be overtaken.
     """
     overtakes = []
-    x_w, y_w = parse_position(white_piece_position)
-    if x_w is None or y_w is None:
+    white_sq = parse_position(white_piece_position)
+    if white_sq is None:
         print("Invalid white piece position.")
         return overtakes
     
-    # Check for overtaking moves for each black piece
-    for piece, position in black_pieces:
-        x_b, y_b = parse_position(position)
-        if x_b is None or y_b is None:
-            print(f"Invalid position for black {piece} at {position}. Skipping.")
-            continue
-
-        # Determine overtaking ability based on white piece type
-        if white_piece_type == 'king':
-            if abs(x_b - x_w) <= 1 and abs(y_b - y_w) <= 1:  # King can move to any adjacent square
-                overtakes.append(f'Black {chess_pieces[piece]} ({position})')
-        elif white_piece_type == 'pawn':
-            # White pawns move upwards: y_b - y_w should be 1
-            if (abs(x_b - x_w) == 1 and y_b - y_w == 1):  # Pawn captures diagonally forward
-                overtakes.append(f'Black {chess_pieces[piece]} ({position})')
+    # All squares the white piece can capture on, tested against every black piece at once
+    capture_mask = capture_tables[white_piece_type][white_sq]
+    black_codes, black_squares = black_pieces
+    overtakes = [f'{BLACK_STR[piece_types[black_codes[i] - BK]]} ({SQ_TO_POS[black_squares[i]]})'
+                 for i in range(len(black_codes)) if (capture_mask >> black_squares[i]) & 1]
     
     return overtakes  # Return the list of overtakes
 
@@ -237,11 +177,11 @@ def main():
 
     # Output the results
     if overtakes:
-        print(f"\nThe following black pieces can be overtaken by the White {chess_pieces[white_piece_type]}:")
+        print(f"\nThe following black pieces can be overtaken by the {WHITE_STR[white_piece_type]}:")
         for overtake in overtakes:
             print(overtake)
     else:
-        print(f"\nNo black pieces can be overtaken by the White {chess_pieces[white_piece_type]}.")
+        print(f"\nNo black pieces can be overtaken by the {WHITE_STR[white_piece_type]}.")
 
 # Run the main function
 if __name__ == "__main__":
@@ -1,20 +1,12 @@
-# Step 1: Define the chessboard and pieces
-def create_chessboard():
-    """
-    Creates an 8x8 chessboard with positions labeled from 'a1' to 'h8'.
+import argparse
+from array import array
 
-    Returns:
-        dict: A dictionary representing the chessboard with all positions initialized to None.
-    """
-    rows = ['1', '2', '3', '4', '5', '6', '7', '8']
-    cols = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h']
-    board = {}
-    for col in cols:
-        for row in rows:
-            board[col + row] = None  # No piece at the start
-    return board
-
-# Mapping piece types to their abbreviations for display
+from chess_check import determine_checkmate
+from chess_common import (EMPTY, KING_ATTACKS, POS_TO_SQ, create_chessboard,
+                          get_piece_and_position, parse_position, piece_codes,
+                          place_piece)
+
+# Step 1: Map piece types to their abbreviations for display
 chess_pieces = {
     'king': 'K',
     'queen': 'Q',
@@ -24,6 +16,13 @@ chess_pieces = {
     'pawn': 'P'
 }
 
+# Reverse mapping from abbreviation to piece type (e.g., 'Q' -> 'queen')
+pieces_by_abbr = {abbr: piece for piece, abbr in chess_pieces.items()}
+
+# Board display for each piece code: White pieces uppercase, Black pieces red and lowercase
+GLYPHS = ('. ',) + tuple(f"{abbr} " for abbr in chess_pieces.values()) \
+    + tuple(f"\033[31m{abbr.lower()}\033[0m " for abbr in chess_pieces.values())
+
 # Step 2: Print game instructions for the user
 def print_instructions():
     """
@@ -49,72 +48,13 @@ Good luck!
 """
     print(instructions)
 
-# Helper function to parse and validate position
-def parse_position(position):
-    """
-    Parses the position string and converts it to numerical coordinates.
-
-    Args:
-        position (str): The position string (e.g., 'e4').
-
-    Returns:
-        tuple: (x, y) coordinates if valid, else (None, None).
-    """
-    if len(position) != 2:
-        return None, None
-    col, row = position[0], position[1]
-    if col not in 'abcdefgh' or row not in '12345678':
-        return None, None
-    x = ord(col) - ord('a')
-    y = int(row) - 1
-    return x, y
-
-# Helper function for user input
-def get_piece_and_position(prompt, allowed_pieces, board, existing_piece_counts=None, max_counts=None):
-    """
-    Prompts the user to input a piece and its position, validating the input.
-
-    Args:
-        prompt (str): The input prompt message.
-        allowed_pieces (list): List of allowed piece types.
-        board (dict): Current state of the chessboard.
-        existing_piece_counts (dict, optional): Current counts of each piece type.
-        max_counts (dict, optional): Maximum allowed counts for each piece type.
-
-    Returns:
-        tuple: (piece, position) if valid, else ('done', 'done').
-    """
-    while True:
-        user_input = input(prompt).strip().lower()
-        if user_input == 'done':
-            return 'done', 'done'
-        parts = user_input.split()
-        if len(parts) != 2:
-            print("Please enter exactly two values: 'piece position' (e.g., 'queen h5').")
-            continue
-        piece, position = parts
-        if piece not in allowed_pieces:
-            print(f"Invalid piece. Allowed pieces: {', '.join(allowed_pieces)}.")
-            continue
-        if position not in board:
-            print("Invalid position. Please enter a position like 'e4'.")
-            continue
-        if board[position] is not None:
-            print("Position already taken. Choose a different position.")
-            continue
-        if existing_piece_counts and max_counts:
-            if existing_piece_counts.get(piece, 0) >= max_counts.get(piece, 1):
-                print(f"You cannot place more than {max_counts[piece]} {piece}(s).")
-                continue
-        return piece, position
-
 # Step 3: Get user input for white and black pieces
 def get_user_input(board):
     """
     Handles user input for placing white and black pieces on the board.
 
     Args:
-        board (dict): The current state of the chessboard.
+        board (bytearray): The current state of the chessboard.
 
     Returns:
         tuple: (white_piece_type, white_piece_position, black_pieces)
@@ -123,7 +63,7 @@ def get_user_input(board):
     white_piece_type, white_piece_position = place_white_piece(board)
 
     # Place black pieces
-    black_pieces = place_black_pieces(board)
+    black_pieces = place_black_pieces(board, white_piece_position)
 
     return white_piece_type, white_piece_position, black_pieces
 
@@ -132,7 +72,7 @@ def place_white_piece(board):
     Prompts the user to place the white king on the board.
 
     Args:
-        board (dict): The current state of the chessboard.
+        board (bytearray): The current state of the chessboard.
 
     Returns:
         tuple: (piece_type, position)
@@ -146,21 +86,23 @@ def place_white_piece(board):
         if piece == 'done':
             print("You must place a white king before proceeding.")
             continue
-        board[position] = f'White {chess_pieces[piece]}'
+        place_piece(board, 'White', piece, position)
         print(f"You placed a White {piece} at {position}.")
         return piece, position
 
-def place_black_pieces(board):
+def place_black_pieces(board, white_king_pos):
     """
     Prompts the user to place black pieces on the board.
 
     Args:
-        board (dict): The current state of the chessboard.
+        board (bytearray): The current state of the chessboard.
+        white_king_pos (str): The position of the white king (e.g., 'e4').
 
     Returns:
-        list: A list of tuples representing black pieces and their positions.
+        tuple: Parallel arrays (piece codes, squares) of the black pieces.
     """
-    black_pieces = []
+    black_codes = array('b')
+    black_squares = array('b')
     black_piece_counts = {
         'pawn': 0,
         'bishop': 0,
@@ -188,7 +130,7 @@ def place_black_pieces(board):
             max_counts=max_piece_counts
         )
         if piece == 'done':
-            if black_pieces:
+            if black_codes:
                 break
             else:
                 print("You must add at least one black piece before typing 'done'.")
@@ -199,308 +141,130 @@ def place_black_pieces(board):
             if black_piece_counts['king'] >= 1:
                 print("Maximum number of kings (1) reached. Cannot add more kings.")
                 continue
-            # Find the white king's position
-            white_king_pos = next((pos for pos, val in board.items() if val and val.startswith('White K')), None)
-            if white_king_pos and is_king_adjacent(position, white_king_pos):
+            if is_king_adjacent(position, white_king_pos):
                 print("Invalid placement. The black king cannot be placed next to the white king.")
                 continue
 
         # Place the piece
-        board[position] = f'Black {chess_pieces[piece]}'
-        black_pieces.append((piece, position))
+        place_piece(board, 'Black', piece, position)
+        black_codes.append(piece_codes[('Black', piece)])
+        black_squares.append(POS_TO_SQ[position])
         black_piece_counts[piece] += 1
         print(f"You placed a Black {piece} at {position}.")
 
-    return black_pieces
+    return black_codes, black_squares
 
-# Helper function to check if kings are adjacent
-def is_king_adjacent(black_king_position, white_king_position):
+def load_position(board, spec):
     """
-    Checks if the black king is adjacent to the white king.
+    Places all pieces from a position string in one pass, without prompting.
+
+    The string lists 'piece position' pairs separated by commas, with the piece
+    given by its abbreviation: uppercase for White, lowercase for Black
+    (e.g., 'K e1, q e3, r a1, k e8'). It must hold exactly one white piece, the
+    king, and at least one black piece.
 
     Args:
-        black_king_position (str): Position of the black king (e.g., 'e5').
-        white_king_position (str): Position of the white king (e.g., 'e4').
+        board (bytearray): The current state of the chessboard.
+        spec (str): The position string.
 
     Returns:
-        bool: True if adjacent, False otherwise.
+        tuple: (white_piece_type, white_piece_position, black_pieces)
+
+    Raises:
+        ValueError: If the string is malformed or describes an invalid position.
     """
-    x_w, y_w = parse_position(white_king_position)
-    x_b, y_b = parse_position(black_king_position)
-    if x_w is None or y_w is None or x_b is None or y_b is None:
-        return False
-    return abs(x_w - x_b) <= 1 and abs(y_w - y_b) <= 1
+    white_piece_type, white_piece_position = None, None
+    black_king_position = None
+    black_codes = array('b')
+    black_squares = array('b')
+    for token in spec.split(','):
+        parts = token.split()
+        if len(parts) != 2:
+            raise ValueError(f"expected 'piece position', got {token.strip()!r}")
+        abbr, position = parts
+        piece = pieces_by_abbr.get(abbr.upper())
+        if piece is None:
+            raise ValueError(f"unknown piece {abbr!r}")
+        square = parse_position(position)
+        if square is None:
+            raise ValueError(f"invalid position {position!r}")
+        if board[square] != EMPTY:
+            raise ValueError(f"two pieces on {position}")
+        if abbr.isupper():
+            if piece != 'king':
+                raise ValueError("the only white piece allowed is the king")
+            if white_piece_position is not None:
+                raise ValueError("only one white king is allowed")
+            place_piece(board, 'White', piece, position)
+            white_piece_type, white_piece_position = piece, position
+        else:
+            if piece == 'king':
+                if black_king_position is not None:
+                    raise ValueError("only one black king is allowed")
+                black_king_position = position
+            place_piece(board, 'Black', piece, position)
+            black_codes.append(piece_codes[('Black', piece)])
+            black_squares.append(square)
+    if white_piece_position is None:
+        raise ValueError("a white king is required (e.g., 'K e1')")
+    if not black_codes:
+        raise ValueError("at least one black piece is required")
+    if black_king_position is not None and is_king_adjacent(black_king_position, white_piece_position):
+        raise ValueError("the black king cannot be placed next to the white king")
+    return white_piece_type, white_piece_position, (black_codes, black_squares)
 
-# Step 4: Determine if the black pieces can checkmate the white king
-def determine_checkmate(board, white_piece_position, black_pieces):
+# Helper function to check if kings are adjacent
+def is_king_adjacent(black_king_position, white_king_position):
     """
-    Determines if the black pieces can checkmate the white king based on their positions.
+    Checks if the black king is adjacent to the white king.
 
     Args:
-        board (dict): The current state of the chessboard.
-        white_piece_position (str): The position of the white king (e.g., 'e4').
-        black_pieces (list): A list of tuples representing black pieces and their positions.
+        black_king_position (str): Position of the black king (e.g., 'e5').
+        white_king_position (str): Position of the white king (e.g., 'e4').
 
     Returns:
-        tuple: (status, escape_positions)
-               status: 'checkmate', 'check', 'stalemate', or 'safe'
-               escape_positions: List of positions the king can escape to (if any)
+        bool: True if adjacent, False otherwise.
     """
-    white_king_pos = white_piece_position
-    x_w, y_w = parse_position(white_king_pos)
-
-    if x_w is None or y_w is None:
-        print("Invalid white king position.")
-        return 'error', []
-
-    def attacks(piece, pos, target_x, target_y):
-        """
-        Determines if a black piece attacks a given square.
-
-        Args:
-            piece (str): The type of the black piece (e.g., 'queen').
-            pos (str): The position of the black piece (e.g., 'h5').
-            target_x (int): X-coordinate of the target square.
-            target_y (int): Y-coordinate of the target square.
-
-        Returns:
-            bool: True if the piece attacks the target square, False otherwise.
-        """
-        x, y = parse_position(pos)
-        if x is None or y is None:
-            return False
-
-        dx = target_x - x
-        dy = target_y - y
-
-        if piece == 'queen':
-            if dx == 0 or dy == 0 or abs(dx) == abs(dy):
-                return is_path_clear(x, y, target_x, target_y)
-        elif piece == 'rook':
-            if dx == 0 or dy == 0:
-                return is_path_clear(x, y, target_x, target_y)
-        elif piece == 'bishop':
-            if abs(dx) == abs(dy):
-                return is_path_clear(x, y, target_x, target_y)
-        elif piece == 'knight':
-            if (abs(dx), abs(dy)) in [(1, 2), (2, 1)]:
-                return True
-        elif piece == 'pawn':
-            # Black pawns move downward (from y to y-1)
-            if dy == -1 and abs(dx) == 1:
-                return True
-        elif piece == 'king':
-            if abs(dx) <= 1 and abs(dy) <= 1:
-                return True
+    white_king_sq = parse_position(white_king_position)
+    black_king_sq = parse_position(black_king_position)
+    if white_king_sq is None or black_king_sq is None:
         return False
+    return bool((KING_ATTACKS[white_king_sq] >> black_king_sq) & 1)
 
-    def is_path_clear(x_start, y_start, x_end, y_end):
-        """
-        Checks if the path between two squares is clear of other pieces.
-
-        Args:
-            x_start (int): X-coordinate of the starting square.
-            y_start (int): Y-coordinate of the starting square.
-            x_end (int): X-coordinate of the ending square.
-            y_end (int): Y-coordinate of the ending square.
-
-        Returns:
-            bool: True if the path is clear, False otherwise.
-        """
-        step_x = 0
-        step_y = 0
-        if x_end > x_start:
-            step_x = 1
-        elif x_end < x_start:
-            step_x = -1
-        if y_end > y_start:
-            step_y = 1
-        elif y_end < y_start:
-            step_y = -1
-
-        current_x = x_start + step_x
-        current_y = y_start + step_y
-
-        while (current_x != x_end or current_y != y_end):
-            pos = f"{chr(current_x + ord('a'))}{current_y + 1}"
-            if board.get(pos) is not None:
-                return False  # Path is blocked
-            current_x += step_x
-            current_y += step_y
-
-        return True  # Path is clear
-
-    def is_in_check():
-        """
-        Checks if the white king is currently in check.
-
-        Returns:
-            bool: True if in check, False otherwise.
-        """
-        for piece, pos in black_pieces:
-            if attacks(piece, pos, x_w, y_w):
-                return True
-        return False
-
-    def can_escape():
-        """
-        Determines if the white king can escape to any adjacent square.
-
-        Returns:
-            list: List of positions the king can safely move to.
-        """
-        escape_positions = []
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue  # Current position
-                new_x = x_w + dx
-                new_y = y_w + dy
-                if 0 <= new_x < 8 and 0 <= new_y < 8:
-                    escape_pos = f"{chr(new_x + ord('a'))}{new_y + 1}"
-                    # Check if the square is occupied by a white piece (only white king exists)
-                    if board[escape_pos] is not None and board[escape_pos].startswith('White'):
-                        continue
-                    if board[escape_pos] is None:
-                        # Square is empty, check if it's under attack
-                        under_attack = False
-                        for piece, pos in black_pieces:
-                            if attacks(piece, pos, new_x, new_y):
-                                under_attack = True
-                                break
-                        if not under_attack:
-                            escape_positions.append(escape_pos)
-                    elif 'Black' in board[escape_pos]:
-                        # Square is occupied by a black piece, simulate capturing
-                        # Find the corresponding black piece tuple
-                        captured_piece_tuple = next((bp for bp in black_pieces if bp[1] == escape_pos), None)
-                        if captured_piece_tuple:
-                            temp_black_pieces = black_pieces.copy()
-                            temp_black_pieces.remove(captured_piece_tuple)
-
-                            # Simulate capturing the piece
-                            original_piece = board[escape_pos]
-                            board[escape_pos] = 'White K'
-                            board[white_piece_position] = None
-
-                            # Check if the king is still in check after capturing
-                            in_check_after_capture = False
-                            for piece_b, pos_b in temp_black_pieces:
-                                if attacks(piece_b, pos_b, new_x, new_y):
-                                    in_check_after_capture = True
-                                    break
-
-                            # Restore the board
-                            board[escape_pos] = original_piece
-                            board[white_piece_position] = 'White K'
-
-                            if not in_check_after_capture:
-                                escape_positions.append(escape_pos)
-        return escape_positions
-
-    def is_checkmate():
-        """
-        Determines if the white king is in checkmate.
-
-        Returns:
-            bool: True if checkmate, False otherwise.
-        """
-        if not is_in_check():
-            return False
-        escape_pos = can_escape()
-        return len(escape_pos) == 0
-
-    def is_stalemate():
-        """
-        Determines if the game is in stalemate.
-
-        Returns:
-            bool: True if stalemate, False otherwise.
-        """
-        if is_in_check():
-            return False
-        escape_pos = can_escape()
-        return len(escape_pos) == 0
-
-    if is_checkmate():
-        return 'checkmate', []
-    elif is_in_check():
-        escape_pos = can_escape()
-        return 'check', escape_pos
-    elif is_stalemate():
-        return 'stalemate', []
-    else:
-        return 'safe', []
-
-# Step 5: Print the final board state
+# Step 4: Print the final board state
 def print_board(board):
     """
     Prints the chess board with pieces in their respective positions.
 
     Args:
-        board (dict): The current state of the chessboard.
+        board (bytearray): The current state of the chessboard.
     """
-    # Dictionary to map piece types to their abbreviations for board display
-    piece_abbr_map = {
-        'king': 'K',
-        'queen': 'Q',
-        'rook': 'R',
-        'bishop': 'B',
-        'knight': 'N',
-        'pawn': 'P'
-    }
-
     print("\nFinal Board State:")
     # Iterate over the rows from 8 to 1
-    for row in range(8, 0, -1):
-        row_str = f"{row} "  # Add row numbers
-        for col in 'abcdefgh':
-            pos = f"{col}{row}"
-            piece = board[pos]
-            if piece is None:
-                row_str += ". "
-            else:
-                parts = piece.split()
-                if len(parts) != 2:
-                    # Invalid piece format; treat as empty
-                    row_str += ". "
-                    continue
-                color, piece_code = parts
-                piece_type = {
-                    'K': 'king',
-                    'Q': 'queen',
-                    'R': 'rook',
-                    'B': 'bishop',
-                    'N': 'knight',
-                    'P': 'pawn'
-                }.get(piece_code.upper(), '')
-                if not piece_type:
-                    # Unknown piece type; treat as empty
-                    row_str += ". "
-                    continue
-                # Get the abbreviation for the piece type
-                piece_abbr = piece_abbr_map.get(piece_type, '?')
-                if color.lower() == 'black':
-                    # Print Black pieces in red, lowercase
-                    row_str += f"\033[31m{piece_abbr.lower()}\033[0m "
-                elif color.lower() == 'white':
-                    # Print White pieces normally, uppercase
-                    row_str += f"{piece_abbr} "
-                else:
-                    # Unknown color; treat as empty
-                    row_str += ". "
-        print(row_str)
+    for row in range(7, -1, -1):
+        print(f"{row + 1} " + "".join(GLYPHS[board[row * 8 + col]] for col in range(8)))
     # Print column labels
     print("  a b c d e f g h\n")
 
-# Step 6: Main game loop
+# Step 5: Main game loop
 def main():
     """
     Main function to execute the Chess Checkmate Detection Game.
     """
+    parser = argparse.ArgumentParser(description="Chess Checkmate Detection Game")
+    parser.add_argument('--pos', help="place all pieces at once instead of prompting, "
+                                      "e.g. 'K e1, q e3, r a1, k e8' (uppercase = White)")
+    args = parser.parse_args()
+
     board = create_chessboard()
-    print_instructions()
-    white_piece_type, white_piece_position, black_pieces = get_user_input(board)
+    if args.pos:
+        try:
+            white_piece_type, white_piece_position, black_pieces = load_position(board, args.pos)
+        except ValueError as error:
+            parser.error(f"--pos: {error}")
+    else:
+        print_instructions()
+        white_piece_type, white_piece_position, black_pieces = get_user_input(board)
 
     # Determine if black pieces can checkmate the white king
     status, escape_positions = determine_checkmate(board, white_piece_position, black_pieces)
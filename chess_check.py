@@ -0,0 +1,244 @@
+"""
+Check, checkmate and stalemate detection for the Chess Checkmate Detection Game.
+
+The board is the bytearray of piece codes defined in chess_common; attack
+tests run on 64-bit bitboards built from it. The module only touches ints,
+lists and bytearrays and is fully annotated, so besides running as plain
+Python it can be compiled ahead of time with
+'mypyc chess_common.py chess_check.py'.
+"""
+from array import array
+from typing import Callable, Final
+
+from chess_common import (BB, BK, BN, BP, BQ, BR, EMPTY, KING_ATTACKS,
+                          KNIGHT_ATTACKS, PAWN_ATTACKS_BLACK, PAWN_ATTACKS_WHITE,
+                          SQ_TO_POS, WK, parse_position)
+
+rook_directions = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+bishop_directions = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+def build_ray_table(dx: int, dy: int) -> list[int]:
+    """
+    Precomputes, for every square, the ray of squares in one direction up to the board edge.
+
+    Args:
+        dx (int): The column step of the direction.
+        dy (int): The row step of the direction.
+
+    Returns:
+        list: 64 bitboards, one per starting square (the square itself excluded).
+    """
+    table = [0] * 64
+    for square in range(64):
+        x, y = (square & 7) + dx, (square >> 3) + dy
+        while 0 <= x < 8 and 0 <= y < 8:
+            table[square] |= 1 << (y * 8 + x)
+            x += dx
+            y += dy
+    return table
+
+# Ray tables of each slider direction, with a flag telling whether the ray runs
+# towards higher square indices (its nearest blocker is then the lowest set bit)
+ROOK_RAYS = [(build_ray_table(dx, dy), dy > 0 or (dy == 0 and dx > 0)) for dx, dy in rook_directions]
+BISHOP_RAYS = [(build_ray_table(dx, dy), dy > 0) for dx, dy in bishop_directions]
+
+def slider_attacks(square: int, occupied: int, rays: list[tuple[list[int], bool]]) -> int:
+    """
+    Computes the squares a sliding piece attacks, stopping at the first blocker.
+
+    Each ray is cut behind its nearest blocker by removing the blocker's own
+    ray in the same direction.
+
+    Args:
+        square (int): The square of the sliding piece (0-63).
+        occupied (int): Bitboard of all occupied squares.
+        rays (list): (ray table, ascending) pairs of the directions the piece slides along.
+
+    Returns:
+        int: Bitboard of attacked squares (including the blockers themselves).
+    """
+    attacked = 0
+    for table, ascending in rays:
+        ray = table[square]
+        blockers = ray & occupied
+        if blockers:
+            if ascending:
+                blocker = (blockers & -blockers).bit_length() - 1
+            else:
+                blocker = blockers.bit_length() - 1
+            ray ^= table[blocker]
+        attacked |= ray
+    return attacked
+
+def rook_attacks(square: int, occupied: int) -> int:
+    """
+    Computes the squares a rook attacks from the ray tables.
+
+    Args:
+        square (int): The square of the rook (0-63).
+        occupied (int): Bitboard of all occupied squares.
+
+    Returns:
+        int: Bitboard of attacked squares.
+    """
+    return slider_attacks(square, occupied, ROOK_RAYS)
+
+def bishop_attacks(square: int, occupied: int) -> int:
+    """
+    Computes the squares a bishop attacks from the ray tables.
+
+    Args:
+        square (int): The square of the bishop (0-63).
+        occupied (int): Bitboard of all occupied squares.
+
+    Returns:
+        int: Bitboard of attacked squares.
+    """
+    return slider_attacks(square, occupied, BISHOP_RAYS)
+
+def queen_attacks(square: int, occupied: int) -> int:
+    """
+    Combines the rook and bishop lookups for a queen.
+
+    Args:
+        square (int): The square of the queen (0-63).
+        occupied (int): Bitboard of all occupied squares.
+
+    Returns:
+        int: Bitboard of attacked squares.
+    """
+    return rook_attacks(square, occupied) | bishop_attacks(square, occupied)
+
+def king_attacks(square: int, occupied: int) -> int:
+    """Looks up the squares a king attacks; blockers do not matter."""
+    return KING_ATTACKS[square]
+
+def knight_attacks(square: int, occupied: int) -> int:
+    """Looks up the squares a knight attacks; blockers do not matter."""
+    return KNIGHT_ATTACKS[square]
+
+def black_pawn_attacks(square: int, occupied: int) -> int:
+    """Looks up the squares a black pawn attacks; blockers do not matter."""
+    return PAWN_ATTACKS_BLACK[square]
+
+# Attack function of each black piece code, all called as (square, occupied)
+ATTACK_FN: Final[dict[int, Callable[[int, int], int]]] = {
+    BK: king_attacks,
+    BQ: queen_attacks,
+    BR: rook_attacks,
+    BB: bishop_attacks,
+    BN: knight_attacks,
+    BP: black_pawn_attacks
+}
+
+def is_in_check(king_sq: int, occupied: int, bitboards: list[int]) -> bool:
+    """
+    Checks if the white king is in check.
+
+    A black piece standing on the king's square never attacks it, so a captured
+    piece needs no special handling.
+
+    Args:
+        king_sq (int): The square of the white king (0-63).
+        occupied (int): Bitboard of all occupied squares.
+        bitboards (list): Bitboard of each piece code's squares, indexed by piece code.
+
+    Returns:
+        bool: True if in check, False otherwise.
+    """
+    # Cheap table lookups first; the slider lookups only run if none of them hits
+    return bool((KNIGHT_ATTACKS[king_sq] & bitboards[BN])
+                or (PAWN_ATTACKS_WHITE[king_sq] & bitboards[BP])
+                or (KING_ATTACKS[king_sq] & bitboards[BK])
+                or (bishop_attacks(king_sq, occupied) & (bitboards[BB] | bitboards[BQ]))
+                or (rook_attacks(king_sq, occupied) & (bitboards[BR] | bitboards[BQ])))
+
+def can_escape(king_sq: int, black_pieces: tuple['array[int]', 'array[int]'], occupied: int,
+               bitboards: list[int]) -> list[str]:
+    """
+    Determines if the white king can escape to any adjacent square.
+
+    Args:
+        king_sq (int): The square of the white king (0-63).
+        black_pieces (tuple): Parallel arrays (piece codes, squares) of the black pieces.
+        occupied (int): Bitboard of all occupied squares.
+        bitboards (list): Bitboard of each piece code's squares, indexed by piece code.
+
+    Returns:
+        list: List of positions the king can safely move to.
+    """
+    white_pieces = 0
+    for code in range(WK, BK):
+        white_pieces |= bitboards[code]
+    black_pieces_bb = occupied & ~white_pieces
+    # Every square attacked by a black piece, built once for all king moves.
+    # The king is taken off the board so that sliders attack through its square.
+    occupied_without_king = occupied ^ (1 << king_sq)
+    danger = 0
+    black_codes, black_squares = black_pieces
+    for i in range(len(black_codes)):
+        danger |= ATTACK_FN[black_codes[i]](black_squares[i], occupied_without_king)
+
+    # King moves not blocked by a white piece
+    moves = KING_ATTACKS[king_sq] & ~white_pieces
+    # Empty squares are safe when no black piece attacks them
+    escapes = moves & ~black_pieces_bb & ~danger
+    # Squares holding a black piece: check the position after the king captures it
+    captures = moves & black_pieces_bb
+    while captures:
+        # Pop the lowest set bit
+        escape_sq = (captures & -captures).bit_length() - 1
+        captures &= captures - 1
+
+        # After the capture only the king's old square becomes empty
+        if not is_in_check(escape_sq, occupied_without_king, bitboards):
+            escapes |= 1 << escape_sq
+
+    escape_positions: list[str] = []
+    while escapes:
+        escape_sq = (escapes & -escapes).bit_length() - 1
+        escapes &= escapes - 1
+        escape_positions.append(SQ_TO_POS[escape_sq])
+    return escape_positions
+
+def determine_checkmate(board: bytearray, white_piece_position: str,
+                        black_pieces: tuple['array[int]', 'array[int]']) -> tuple[str, list[str]]:
+    """
+    Determines if the black pieces can checkmate the white king based on their positions.
+
+    Args:
+        board (bytearray): The current state of the chessboard.
+        white_piece_position (str): The position of the white king (e.g., 'e4').
+        black_pieces (tuple): Parallel arrays (piece codes, squares) of the black pieces.
+
+    Returns:
+        tuple: (status, escape_positions)
+               status: 'checkmate', 'check', 'stalemate', or 'safe'
+               escape_positions: List of positions the king can escape to (if any)
+    """
+    king_sq = parse_position(white_piece_position)
+
+    if king_sq is None:
+        print("Invalid white king position.")
+        return 'error', []
+
+    # Bitboards of the position, built once from the board
+    bitboards = [0] * (BP + 1)
+    occupied = 0
+    for square in range(64):
+        code = board[square]
+        if code != EMPTY:
+            bitboards[code] |= 1 << square
+            occupied |= 1 << square
+
+    # Compute the check status and the escape squares once, then classify
+    in_check = is_in_check(king_sq, occupied, bitboards)
+    escape_positions = can_escape(king_sq, black_pieces, occupied, bitboards)
+    if in_check and not escape_positions:
+        return 'checkmate', []
+    elif in_check:
+        return 'check', escape_positions
+    elif not escape_positions:
+        return 'stalemate', []
+    else:
+        return 'safe', []
@@ -0,0 +1,155 @@
+"""
+Board representation and helpers shared by the chess games.
+
+The board is a bytearray of piece codes, one byte per square. Square (x, y)
+is index y * 8 + x, so 'a1' is 0 and 'h8' is 63. Lookup tables that depend
+only on the geometry of the board are built here once per process.
+"""
+import re
+from typing import Final, Optional
+
+# Piece types in piece-code order
+piece_types = ['king', 'queen', 'rook', 'bishop', 'knight', 'pawn']
+
+# Piece codes stored on the board: white pieces are 1-6, black pieces 7-12
+EMPTY: Final = 0
+WK: Final = 1
+WQ: Final = 2
+WR: Final = 3
+WB: Final = 4
+WN: Final = 5
+WP: Final = 6
+BK: Final = 7
+BQ: Final = 8
+BR: Final = 9
+BB: Final = 10
+BN: Final = 11
+BP: Final = 12
+
+# Piece code for each (color, piece) pair (e.g., ('Black', 'pawn') -> BP)
+piece_codes = {(color, piece): offset + index
+               for color, offset in (('White', WK), ('Black', BK))
+               for index, piece in enumerate(piece_types)}
+
+# Step 1: Define the chessboard
+def create_chessboard() -> bytearray:
+    """
+    Creates an 8x8 chessboard stored as one byte per square.
+
+    Returns:
+        bytearray: A chessboard with all 64 squares initialized to EMPTY.
+    """
+    return bytearray(64)
+
+# Lookup tables between position strings and square indices ('a1' = 0, 'h8' = 63)
+POS_TO_SQ = {f"{col}{row}": (ord(col) - ord('a')) + (row - 1) * 8 for col in 'abcdefgh' for row in range(1, 9)}
+SQ_TO_POS = [f"{chr(ord('a') + (sq & 7))}{(sq >> 3) + 1}" for sq in range(64)]
+
+# Helper function to parse and validate position
+def parse_position(position: str) -> Optional[int]:
+    """
+    Parses the position string and converts it to a square index.
+
+    Args:
+        position (str): The position string (e.g., 'e4').
+
+    Returns:
+        int: The square index (0-63) if valid, else None.
+    """
+    return POS_TO_SQ.get(position)
+
+# Helper function to put a piece on the board
+def place_piece(board: bytearray, color: str, piece: str, position: str) -> None:
+    """
+    Stores the code of a piece on its square.
+
+    Args:
+        board (bytearray): The current state of the chessboard.
+        color (str): 'White' or 'Black'.
+        piece (str): The type of the piece (e.g., 'queen').
+        position (str): The position string (e.g., 'h5').
+    """
+    board[POS_TO_SQ[position]] = piece_codes[(color, piece)]
+
+# File masks used to drop squares that wrapped around the board edge
+NOT_A_FILE: Final = 0xFEFEFEFEFEFEFEFE
+NOT_H_FILE: Final = 0x7F7F7F7F7F7F7F7F
+
+def build_leaper_table(offsets: list[tuple[int, int]]) -> list[int]:
+    """
+    Precomputes the attack bitboard of a non-sliding piece for every square.
+
+    Args:
+        offsets (list): The (dx, dy) steps the piece can make.
+
+    Returns:
+        list: 64 bitboards, one per square the piece can stand on.
+    """
+    table = [0] * 64
+    for square in range(64):
+        x, y = square & 7, square >> 3
+        for dx, dy in offsets:
+            if 0 <= x + dx < 8 and 0 <= y + dy < 8:
+                table[square] |= 1 << ((y + dy) * 8 + x + dx)
+    return table
+
+KNIGHT_ATTACKS = build_leaper_table([(1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2)])
+KING_ATTACKS = build_leaper_table([(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy])
+# Black pawns capture diagonally downward (from y to y-1)
+PAWN_ATTACKS_BLACK = [((1 << sq >> 7) & NOT_A_FILE) | ((1 << sq >> 9) & NOT_H_FILE) for sq in range(64)]
+# White pawns capture diagonally upward; from a target square this gives the black pawns attacking it
+PAWN_ATTACKS_WHITE = [((1 << sq << 7) & NOT_H_FILE) | ((1 << sq << 9) & NOT_A_FILE) for sq in range(64)]
+
+# A 'piece position' entry (e.g., 'queen h5'), split into its two fields in one pass;
+# the fields themselves are validated afterwards so each gets its own message
+_TOKEN_RE = re.compile(r'^(\S+)\s+(\S+)$')
+
+# Helper function for user input
+def get_piece_and_position(prompt: str, allowed_pieces: list[str], board: bytearray,
+                           existing_piece_counts: Optional[dict[str, int]] = None,
+                           max_counts: Optional[dict[str, int]] = None,
+                           total_pieces: Optional[int] = None, max_total: int = 16) -> tuple[str, str]:
+    """
+    Prompts the user to input a piece and its position, validating the input.
+
+    Args:
+        prompt (str): The input prompt message.
+        allowed_pieces (list): List of allowed piece types.
+        board (bytearray): Current state of the chessboard.
+        existing_piece_counts (dict, optional): Current counts of each piece type.
+        max_counts (dict, optional): Maximum allowed counts for each piece type.
+        total_pieces (int, optional): Number of pieces placed so far.
+        max_total (int, optional): Maximum number of pieces allowed in total.
+
+    Returns:
+        tuple: (piece, position) if valid, else ('done', 'done').
+    """
+    allowed = frozenset(allowed_pieces)
+    while True:
+        if total_pieces is not None and total_pieces >= max_total:
+            print(f"You have reached the maximum number of black pieces ({max_total}).")
+            return 'done', 'done'
+
+        user_input = input(prompt).strip().lower()
+        if user_input == 'done':
+            return 'done', 'done'
+        match = _TOKEN_RE.match(user_input)
+        if match is None:
+            print("Please enter exactly two values: 'piece position' (e.g., 'queen h5').")
+            continue
+        piece, position = match.group(1), match.group(2)
+        if piece not in allowed:
+            print(f"Invalid piece. Allowed pieces: {', '.join(allowed_pieces)}.")
+            continue
+        square = POS_TO_SQ.get(position)
+        if square is None:
+            print("Invalid position. Please enter a position like 'e4'.")
+            continue
+        if board[square] != EMPTY:
+            print("Position already taken. Choose a different position.")
+            continue
+        if existing_piece_counts and max_counts:
+            if existing_piece_counts.get(piece, 0) >= max_counts.get(piece, 1):
+                print(f"You cannot place more than {max_counts[piece]} {piece}(s).")
+                continue
+        return piece, position